@@ -1,22 +1,21 @@
 from __future__ import annotations
 
 import logging
-import traceback
 from typing import List
-from dataclasses import asdict
 
-from ..tools import LogReaderTool, GeminiAnalysisTool, JiraTool, LogEntry
+from ..tools import LogEntry, shared_log_reader, shared_analyzer, shared_jira
 
 logger = logging.getLogger(__name__)
 
 
 class LogIngestionAgent:
     def __init__(self, log_dir: str | None = None) -> None:
-        self.reader = LogReaderTool(log_dir or "logs")
+        self.reader = shared_log_reader()
+        self.log_dir = log_dir
 
     def run(self) -> List[LogEntry]:
         try:
-            entries = self.reader.read_logs()
+            entries = self.reader.read_logs(self.log_dir)
             logger.info("LogIngestionAgent: read %d entries", len(entries))
             return entries
         except Exception as e:
@@ -26,25 +25,11 @@ class LogIngestionAgent:
 
 class LogAnalysisAgent:
     def __init__(self) -> None:
-        self.analyzer = GeminiAnalysisTool()
+        self.analyzer = shared_analyzer()
 
     def run(self, entries: List[LogEntry]) -> List[dict]:
         try:
-            serial = [
-                {
-                    "timestamp": (e.timestamp.isoformat() if e.timestamp else None),
-                    "level": e.level,
-                    "service": e.service,
-                    "message": e.message,
-                    "raw": e.raw,
-                }
-                for e in entries
-            ]
-            out = self.analyzer._run(serial)
-            import json
-
-            parsed = json.loads(out) if out else {"incidents": []}
-            incidents = parsed.get("incidents", []) if isinstance(parsed, dict) else []
+            incidents = self.analyzer._run_structured(entries)
             logger.info("LogAnalysisAgent: detected %d incidents", len(incidents))
             return incidents
         except Exception as e:
@@ -54,20 +39,32 @@ class LogAnalysisAgent:
 
 class TicketCreationAgent:
     def __init__(self) -> None:
-        self.jira = JiraTool()
+        self.jira = shared_jira()
 
     def run(self, incidents: List[dict]) -> List[dict]:
         created = []
+        issues = []
         for inc in incidents:
             try:
                 title = inc.get("title") or f"Incident in {inc.get('service','unknown')}"
                 desc = inc.get("description") or "No description provided"
                 svc = inc.get("service")
-                url = self.jira._run(title=title, description=desc, service=svc)
-                if url:
-                    created.append({"title": title, "url": url})
+                issues.append({"title": title, "description": desc, "service": svc})
             except Exception as e:
                 logger.exception("TicketCreationAgent failed for incident %s: %s", inc, e)
                 continue
+
+        try:
+            results = self.jira.create_issues(issues)
+        except Exception as e:
+            logger.exception("TicketCreationAgent failed to create tickets: %s", e)
+            return created
+
+        for issue, res in zip(issues, results):
+            if isinstance(res, BaseException):
+                logger.error("TicketCreationAgent failed for incident %s: %s", issue["title"], res)
+                continue
+            if res:
+                created.append({"title": issue["title"], "url": res})
         logger.info("TicketCreationAgent: created %d tickets", len(created))
         return created
@@ -1,16 +1,70 @@
 from __future__ import annotations
 
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task, before_kickoff
+from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from typing import Callable, List
+import asyncio
 import logging
-import traceback
 
-from .tools import LogReaderTool, GeminiAnalysisTool, JiraTool
+from .tools import (
+    LogReaderTool,
+    GeminiAnalysisTool,
+    JiraTool,
+    JiraAuthFailures,
+    IncidentMerger,
+    shared_log_reader,
+    shared_analyzer,
+    shared_jira,
+)
+from .tools.run_sync import run_sync
 
 logger = logging.getLogger(__name__)
 
+# Entries handed to each Gemini call; matches the prompt's sample limit
+ANALYSIS_BATCH_SIZE = GeminiAnalysisTool.SAMPLE_LIMIT
+# Maximum number of batches being analyzed at the same time
+ANALYSIS_CONCURRENCY = GeminiAnalysisTool.MAX_PARALLEL_REQUESTS
+# Maximum number of Jira issues being created at the same time
+TICKET_CONCURRENCY = JiraTool.MAX_CONCURRENCY
+
+
+def _error_record(stage: str, e: BaseException, **extra) -> dict:
+    """Build a summary error entry; the traceback is already in the log."""
+    return {"stage": stage, **extra, "error": str(e)}
+
+
+# Receives (kind, record) for every incident, ticket and error as it happens;
+# kind is one of "incident", "ticket", "error" or "incident_update". An
+# incident is emitted when first seen, before its ticket; if later batches
+# add to its occurrences, an "incident_update" record with the title, service
+# and summed occurrences follows once analysis has finished.
+RecordSink = Callable[[str, dict], None]
+
+_SUMMARY_LISTS = {"incident": "incidents", "ticket": "tickets", "error": "errors"}
+
+
+def _emit(summary: dict, sink: RecordSink | None, kind: str, record: dict) -> None:
+    """Hand a record to the sink, or keep it in the summary when there is none."""
+    if sink is None:
+        summary[_SUMMARY_LISTS[kind]].append(record)
+        return
+    try:
+        sink(kind, record)
+    except Exception as e:
+        logger.exception("Pipeline record sink failed for %s record: %s", kind, e)
+
+
+def _empty_summary() -> dict:
+    return {
+        "logs_scanned": 0,
+        "incidents_detected": 0,
+        "jira_tickets_created": 0,
+        "incidents": [],
+        "tickets": [],
+        "errors": [],
+    }
+
 
 @CrewBase
 class LoggerFlow():
@@ -84,85 +138,165 @@ class LoggerFlow():
             verbose=True,
         )
 
-    def run_pipeline(self, inputs: dict | None = None) -> dict:
+    def run_pipeline(self, inputs: dict | None = None, sink: RecordSink | None = None) -> dict:
         """Execute the end-to-end pipeline using local tools.
 
         This method is deliberately resilient: it never raises; it logs exceptions
         and returns a summary dict with counts and lists of incidents/tickets.
-        """
-        summary = {
-            "logs_scanned": 0,
-            "incidents_detected": 0,
-            "jira_tickets_created": 0,
-            "incidents": [],
-            "tickets": [],
-            "errors": [],
-        }
+        When `sink` is given, incidents, tickets and errors are streamed to it
+        as they are produced and the summary lists stay empty; occurrence
+        totals of incidents seen again in later batches arrive last, as
+        "incident_update" records (see RecordSink).
 
+        Callers already inside an event loop should await run_pipeline_async;
+        called from one anyway, this runs the pipeline on a worker thread.
+        """
         try:
-            # 1) Ingest logs
-            reader = LogReaderTool()
-            entries = []
+            return run_sync(self.run_pipeline_async(inputs, sink))
+        except Exception as e:
+            logger.exception("Unexpected pipeline error: %s", e)
+            summary = _empty_summary()
+            _emit(summary, sink, "error", _error_record("pipeline", e))
+            return summary
+
+    async def run_pipeline_async(self, inputs: dict | None = None, sink: RecordSink | None = None) -> dict:
+        """Run ingest, analyze and ticket stages concurrently.
+
+        Stages are connected by queues: ingested entries are analyzed in
+        batches of ANALYSIS_BATCH_SIZE (at most ANALYSIS_CONCURRENCY at once),
+        and tickets are created as soon as new incidents come out of the
+        analyzer (at most TICKET_CONCURRENCY at once). Incidents repeated
+        across batches are merged by (title, service) with their occurrences
+        summed, as in GeminiAnalysisTool._run_structured. Each incident is
+        emitted when first seen; summed totals follow once analysis finishes.
+        """
+        summary = _empty_summary()
+        log_q: asyncio.Queue = asyncio.Queue()
+        inc_q: asyncio.Queue = asyncio.Queue()
+
+        async def ingest() -> None:
+            reader = shared_log_reader()
+            loop = asyncio.get_running_loop()
+
+            def push(batch: list) -> None:
+                summary["logs_scanned"] += len(batch)
+                log_q.put_nowait(batch)
+
+            def read_batches() -> None:
+                # Runs on a worker thread; each full batch is handed to the
+                # loop right away so analysis starts while files are parsed
+                batch = []
+                for entry in reader.iter_logs():
+                    batch.append(entry)
+                    if len(batch) == ANALYSIS_BATCH_SIZE:
+                        loop.call_soon_threadsafe(push, batch)
+                        batch = []
+                if batch:
+                    loop.call_soon_threadsafe(push, batch)
+
             try:
-                entries = reader.read_logs()
-                summary["logs_scanned"] = len(entries)
-                logger.info("Ingested %d log entries", len(entries))
+                await asyncio.to_thread(read_batches)
+                logger.info("Ingested %d log entries", summary["logs_scanned"])
             except Exception as e:
                 logger.exception("Error ingesting logs: %s", e)
-                summary["errors"].append({"stage": "ingest", "error": str(e), "trace": traceback.format_exc()})
-
-            # Prepare serialized logs for Gemini
-            serial_logs = [
-                {
-                    "timestamp": (le.timestamp.isoformat() if le.timestamp else None),
-                    "level": le.level,
-                    "service": le.service,
-                    "message": le.message,
-                    "raw": le.raw,
-                }
-                for le in entries
-            ]
-
-            # 2) Analyze logs via Gemini
-            analyzer = GeminiAnalysisTool()
-            incidents = []
-            try:
-                gemini_out = analyzer._run(serial_logs)
-                # gemini_out is JSON string with {"incidents": [...]}
-                import json
-
-                parsed = json.loads(gemini_out)
-                incidents = parsed.get("incidents", []) if isinstance(parsed, dict) else []
-                summary["incidents_detected"] = len(incidents)
-                summary["incidents"] = incidents
-                logger.info("Gemini detected %d incidents", len(incidents))
-            except Exception as e:
-                logger.exception("Error analyzing logs with Gemini: %s", e)
-                summary["errors"].append({"stage": "analyze", "error": str(e), "trace": traceback.format_exc()})
+                _emit(summary, sink, "error", _error_record("ingest", e))
+            finally:
+                await log_q.put(None)
+
+        async def analyze() -> None:
+            analyzer = shared_analyzer()
+            limit = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+            merger = IncidentMerger()
+            # Occurrences each incident had when emitted, aligned with merger.incidents
+            emitted_occurrences: list = []
+            # Analysis tasks in batch order, so results merge deterministically
+            task_q: asyncio.Queue = asyncio.Queue()
 
-            # 3) Create Jira tickets for each incident
-            jira = JiraTool()
-            tickets = []
-            for inc in incidents:
+            async def analyze_batch(batch) -> list:
+                async with limit:
+                    return await asyncio.to_thread(analyzer._run_structured, batch)
+
+            async def dispatch() -> None:
                 try:
-                    title = inc.get("title") or f"Incident in {inc.get('service','unknown')}"
-                    desc = inc.get("description") or "No description provided"
-                    service = inc.get("service")
-                    issue_url = jira._run(title=title, description=desc, service=service)
-                    if issue_url:
-                        tickets.append({"incident": title, "url": issue_url})
-                        summary["jira_tickets_created"] += 1
-                        logger.info("Created Jira ticket for incident: %s -> %s", title, issue_url)
-                    else:
-                        logger.error("Failed to create Jira ticket for incident: %s", title)
-                except Exception as e:
-                    logger.exception("Error creating ticket for incident %s: %s", inc, e)
-                    summary["errors"].append({"stage": "ticket", "incident": inc, "error": str(e), "trace": traceback.format_exc()})
-
-            summary["tickets"] = tickets
+                    while (batch := await log_q.get()) is not None:
+                        await task_q.put(asyncio.create_task(analyze_batch(batch)))
+                finally:
+                    await task_q.put(None)
+
+            dispatcher = asyncio.create_task(dispatch())
+            try:
+                while (pending := await task_q.get()) is not None:
+                    try:
+                        incidents = await pending
+                    except Exception as e:
+                        logger.exception("Error analyzing logs with Gemini: %s", e)
+                        _emit(summary, sink, "error", _error_record("analyze", e))
+                        continue
+
+                    for inc in incidents:
+                        if merger.add(inc):
+                            first = merger.incidents[-1]
+                            summary["incidents_detected"] += 1
+                            emitted_occurrences.append(
+                                first.get("occurrences") if isinstance(first, dict) else None
+                            )
+                            _emit(summary, sink, "incident", first)
+                            await inc_q.put(first)
+                await dispatcher
+                logger.info("Gemini detected %d incidents", summary["incidents_detected"])
+            finally:
+                dispatcher.cancel()
+                # Summary lists hold the merged dicts themselves and are
+                # already up to date; a sink only saw the first counts
+                if sink is not None:
+                    for inc, occurrences in zip(merger.incidents, emitted_occurrences):
+                        if isinstance(inc, dict) and inc.get("occurrences") != occurrences:
+                            _emit(summary, sink, "incident_update", {
+                                "title": inc.get("title"),
+                                "service": inc.get("service"),
+                                "occurrences": inc.get("occurrences"),
+                            })
+                await inc_q.put(None)
 
+        async def create_tickets() -> None:
+            jira = shared_jira()
+            limit = asyncio.Semaphore(TICKET_CONCURRENCY)
+            # Scoped to this run: a rejection only skips this run's tickets
+            auth_failures = JiraAuthFailures()
+
+            async def create(client, inc) -> None:
+                async with limit:
+                    try:
+                        title = inc.get("title") or f"Incident in {inc.get('service','unknown')}"
+                        desc = inc.get("description") or "No description provided"
+                        service = inc.get("service")
+                        issue_url = await jira._run_async(
+                            title=title,
+                            description=desc,
+                            service=service,
+                            client=client,
+                            auth_failures=auth_failures,
+                        )
+                        if issue_url:
+                            _emit(summary, sink, "ticket", {"incident": title, "url": issue_url})
+                            summary["jira_tickets_created"] += 1
+                            logger.info("Created Jira ticket for incident: %s -> %s", title, issue_url)
+                        else:
+                            logger.error("Failed to create Jira ticket for incident: %s", title)
+                    except Exception as e:
+                        logger.exception("Error creating ticket for incident %s: %s", inc, e)
+                        _emit(summary, sink, "error", _error_record("ticket", e, incident=inc))
+
+            async with jira._async_client() as client:
+                pending = []
+                while (inc := await inc_q.get()) is not None:
+                    pending.append(asyncio.create_task(create(client, inc)))
+                await asyncio.gather(*pending)
+
+        try:
+            await asyncio.gather(ingest(), analyze(), create_tickets())
         except Exception as e:
             logger.exception("Unexpected pipeline error: %s", e)
-            summary["errors"].append({"stage": "pipeline", "error": str(e), "trace": traceback.format_exc()})
+            _emit(summary, sink, "error", _error_record("pipeline", e))
 
         return summary
@@ -3,11 +3,10 @@ from __future__ import annotations
 
 import os
 import sys
-import json
 import logging
-import traceback
 import warnings
 from datetime import datetime
+import orjson
 from dotenv import load_dotenv
 from logger_flow.crew import LoggerFlow
 
@@ -22,31 +21,50 @@ logger = logging.getLogger(__name__)
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 
+def _ndjson_sink(fh):
+    """Return a pipeline sink that appends each record to `fh` as one JSON line."""
+    def write(kind: str, record: dict) -> None:
+        fh.write(orjson.dumps({"type": kind, "data": record}, option=orjson.OPT_APPEND_NEWLINE, default=str))
+    return write
+
+
 def main():
     """Run the LoggerFlow pipeline end-to-end and print a concise summary."""
     try:
         logger.info("Starting LoggerFlow pipeline")
         crew = LoggerFlow()
-        result = crew.run_pipeline()
-
-        # Print short summary
-        summary = {
-            "logs_scanned": result.get("logs_scanned", 0),
-            "incidents_detected": result.get("incidents_detected", 0),
-            "jira_tickets_created": result.get("jira_tickets_created", 0),
-        }
 
-        print(json.dumps(summary, indent=2))
-        logger.info("Pipeline finished: %s", summary)
-
-        # Optionally dump detailed result to a file for inspection
+        # Stream incidents, tickets and errors to disk as NDJSON while the
+        # pipeline runs; the final line holds the summary counts.
+        out_path = os.path.join(os.getcwd(), "logger_flow_pipeline_result.ndjson")
         try:
-            out_path = os.path.join(os.getcwd(), "logger_flow_pipeline_result.json")
-            with open(out_path, "w", encoding="utf-8") as fh:
-                json.dump(result, fh, indent=2)
-            logger.info("Detailed pipeline result written to %s", out_path)
+            out_fh = open(out_path, "wb")
         except Exception:
-            logger.exception("Failed to write detailed pipeline result: %s", traceback.format_exc())
+            logger.exception("Failed to open detailed pipeline result file %s", out_path)
+            out_fh = None
+
+        try:
+            result = crew.run_pipeline(sink=_ndjson_sink(out_fh) if out_fh else None)
+
+            # Print short summary
+            summary = {
+                "logs_scanned": result.get("logs_scanned", 0),
+                "incidents_detected": result.get("incidents_detected", 0),
+                "jira_tickets_created": result.get("jira_tickets_created", 0),
+            }
+
+            print(orjson.dumps(summary, option=orjson.OPT_INDENT_2).decode())
+            logger.info("Pipeline finished: %s", summary)
+
+            if out_fh:
+                try:
+                    _ndjson_sink(out_fh)("summary", summary)
+                    logger.info("Detailed pipeline result written to %s", out_path)
+                except Exception:
+                    logger.exception("Failed to write detailed pipeline result")
+        finally:
+            if out_fh:
+                out_fh.close()
 
         return result
 
@@ -120,8 +138,8 @@ def run_with_trigger():
         raise Exception("No trigger payload provided. Please provide JSON payload as argument.")
 
     try:
-        trigger_payload = json.loads(sys.argv[1])
-    except json.JSONDecodeError:
+        trigger_payload = orjson.loads(sys.argv[1])
+    except orjson.JSONDecodeError:
         raise Exception("Invalid JSON payload provided as argument")
 
     inputs = {
@@ -1,10 +1,36 @@
-from .log_reader_tool import LogReaderTool, LogEntry
-from .gemini_analysis_tool import GeminiAnalysisTool
-from .jira_tool import JiraTool
+from functools import cache
+
+from .log_reader_tool import LogReaderTool, LogEntry, LogColumns
+from .gemini_analysis_tool import GeminiAnalysisTool, IncidentMerger
+from .jira_tool import JiraTool, JiraAuthFailures
+
+
+# Process-wide tool instances: avoids re-running Pydantic validation and
+# env lookups every time an agent or pipeline run needs a tool.
+@cache
+def shared_log_reader() -> LogReaderTool:
+    return LogReaderTool()
+
+
+@cache
+def shared_analyzer() -> GeminiAnalysisTool:
+    return GeminiAnalysisTool()
+
+
+@cache
+def shared_jira() -> JiraTool:
+    return JiraTool()
+
 
 __all__ = [
     "LogReaderTool",
     "LogEntry",
+    "LogColumns",
     "GeminiAnalysisTool",
+    "IncidentMerger",
     "JiraTool",
-]
\ No newline at end of file
+    "JiraAuthFailures",
+    "shared_log_reader",
+    "shared_analyzer",
+    "shared_jira",
+]
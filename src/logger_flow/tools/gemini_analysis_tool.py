@@ -2,15 +2,116 @@ from __future__ import annotations
 
 import os
 import json
+import time
+import hashlib
 import logging
-from typing import List, Any, ClassVar, Type
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Any, ClassVar, Type
 
+import orjson
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 from crewai import LLM
 
+from .log_reader_tool import LogEntry
+from .rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
+# Gemini quotas, shared by every analysis call in the process. Buckets hold a
+# full minute of budget and refill continuously; 0 disables a limit.
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "15"))
+GEMINI_TPM = float(os.getenv("GEMINI_TPM", "1000000"))
+_REQUEST_LIMITER = RateLimiter(GEMINI_RPM / 60, capacity=GEMINI_RPM)
+_TOKEN_LIMITER = RateLimiter(GEMINI_TPM / 60, capacity=GEMINI_TPM)
+
+
+def _wait_for_quota(prompt: str) -> None:
+    """Block until both the request and the token budget allow this prompt."""
+    # Rough estimate: ~4 characters per token
+    delay = max(_REQUEST_LIMITER.reserve(), _TOKEN_LIMITER.reserve(len(prompt) // 4))
+    if delay > 0:
+        logger.info("Gemini quota reached; waiting %.1fs", delay)
+        time.sleep(delay)
+
+
+def _format_log(log: LogEntry | dict) -> str:
+    """Render one prompt line: "timestamp | level | service | message"."""
+    if isinstance(log, LogEntry):
+        ts = log.timestamp
+        return f"{ts.isoformat() if ts else None} | {log.level} | {log.service} | {log.message}"
+    # Dicts come from CrewAI tool calls, so keys may be missing
+    get = log.get
+    return f"{get('timestamp')} | {get('level')} | {get('service')} | {get('message')}"
+
+
+def _dumps(obj: Any) -> str:
+    try:
+        return orjson.dumps(obj).decode()
+    except TypeError:
+        # orjson rejects a few values (e.g. ints beyond 64 bits); stdlib copes
+        return json.dumps(obj)
+
+
+def _loads(text: str) -> Any:
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        # orjson is strict JSON; the stdlib also accepts NaN and Infinity,
+        # which models occasionally emit
+        return json.loads(text)
+
+
+def _batched(logs: Iterable, size: int) -> Iterator[list]:
+    it = iter(logs)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+class IncidentMerger:
+    """Merge incidents sharing (title, service), summing their occurrences.
+
+    The first incident seen for a key is kept (as a copy) and later ones only
+    add to its "occurrences"; non-dict items and incidents whose title or
+    service is unhashable (model output is untrusted) are passed through
+    untouched.
+    """
+
+    def __init__(self) -> None:
+        self._merged: dict[tuple, dict] = {}
+        self.incidents: list = []
+
+    def add(self, inc: Any) -> bool:
+        """Merge one incident; returns True if it was not seen before."""
+        if not isinstance(inc, dict):
+            self.incidents.append(inc)
+            return True
+        key = (inc.get("title"), inc.get("service"))
+        try:
+            first = self._merged.get(key)
+        except TypeError:
+            self.incidents.append(inc)
+            return True
+        if first is None:
+            self._merged[key] = first = dict(inc)
+            self.incidents.append(first)
+            return True
+        if isinstance(first.get("occurrences"), int) and isinstance(inc.get("occurrences"), int):
+            first["occurrences"] += inc["occurrences"]
+        return False
+
+
+def _dedupe_incidents(incidents: Iterable[dict]) -> list[dict]:
+    """Merge incidents sharing (title, service), summing their occurrences."""
+    merger = IncidentMerger()
+    for inc in incidents:
+        merger.add(inc)
+    return merger.incidents
+
 
 class GeminiAnalysisInput(BaseModel):
     logs: List[dict] = Field(
@@ -33,18 +134,60 @@ class GeminiAnalysisTool(BaseTool):
         os.getenv("GEMINI_API_KEY")
     )
     TIMEOUT: ClassVar[int] = 30
+    # Maximum number of log lines included in a single prompt; larger log sets
+    # are split into windows of this size and analyzed in parallel
+    SAMPLE_LIMIT: ClassVar[int] = 200
+    MAX_PARALLEL_REQUESTS: ClassVar[int] = 4
+
+    # Analysis cache: identical prompts are answered without calling Gemini.
+    # The most recent CACHE_SIZE entries stay in memory (least recently used
+    # go first); all entries are persisted under CACHE_DIR across runs.
+    CACHE_DIR: ClassVar[str] = os.getenv(
+        "GEMINI_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "logger_flow", "gemini"),
+    )
+    CACHE_SIZE: ClassVar[int] = 256
+    _CACHE: ClassVar[OrderedDict[str, list[dict]]] = OrderedDict()
+    _CACHE_LOCK: ClassVar[threading.Lock] = threading.Lock()
 
-    def _run(self, logs: List[dict], **kwargs) -> str:
+    def _run(self, logs: Iterable[LogEntry | dict], **kwargs) -> str:
         """Analyze logs with Gemini and return JSON string: {"incidents": [...]}."""
+        return _dumps({"incidents": self._run_structured(logs)})
+
+    def _run_structured(self, logs: Iterable[LogEntry | dict]) -> list[dict]:
+        """Analyze logs with Gemini and return the list of incidents.
+
+        Logs are split into windows of SAMPLE_LIMIT lines, analyzed with up to
+        MAX_PARALLEL_REQUESTS concurrent Gemini calls, and the resulting
+        incidents are merged by (title, service).
+        """
         if not self.GEMINI_KEY:
             logger.error(
                 "GEMINI_API_KEY or GOOGLE_API_KEY not set; skipping Gemini analysis"
             )
-            return json.dumps({"incidents": []})
+            return []
 
+        windows = list(_batched(logs, self.SAMPLE_LIMIT))
+        if len(windows) <= 1:
+            results = [self._analyze_window(w) for w in windows]
+        else:
+            workers = min(self.MAX_PARALLEL_REQUESTS, len(windows))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._analyze_window, windows))
+
+        return _dedupe_incidents(chain.from_iterable(results))
+
+    def _analyze_window(self, logs: List[LogEntry | dict]) -> list[dict]:
+        """Run a single Gemini call over one window of logs."""
         # Build prompt from logs
         prompt = self._build_prompt(logs)
 
+        cache_key = self._cache_key(prompt)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("Gemini analysis cache hit (%s)", cache_key)
+            return cached
+
         # Create LLM instance using CrewAI's native Gemini integration
         # (model and temperature as you requested)
         llm = LLM(
@@ -55,6 +198,8 @@ class GeminiAnalysisTool(BaseTool):
         )
 
         try:
+            _wait_for_quota(prompt)
+
             # Call the model; CrewAI's LLM interface uses .call(prompt) for text
             text = llm.call(prompt)
 
@@ -62,28 +207,20 @@ class GeminiAnalysisTool(BaseTool):
             incidents = self._extract_json_from_text(text)
             if incidents is None:
                 logger.error("Gemini returned non-JSON or invalid output; skipping")
-                return json.dumps({"incidents": []})
+                return []
 
-            return json.dumps({"incidents": incidents})
+            self._cache_put(cache_key, incidents)
+            return incidents
 
         except Exception as e:
             logger.exception("Gemini analysis failed: %s", e)
-            return json.dumps({"incidents": []})
+            return []
 
     # ----------------- Internal helpers -----------------
 
-    def _build_prompt(self, logs: List[dict]) -> str:
+    def _build_prompt(self, logs: Iterable[LogEntry | dict]) -> str:
         # Keep prompt concise; ask for strict JSON array of incidents
-        sample_limit = 200
-        summary_lines = []
-        for log in logs[:sample_limit]:
-            ts = log.get("timestamp")
-            lvl = log.get("level")
-            svc = log.get("service")
-            msg = log.get("message")
-            summary_lines.append(f"{ts} | {lvl} | {svc} | {msg}")
-
-        logs_text = "\n".join(summary_lines)
+        logs_text = "\n".join(map(_format_log, islice(logs, self.SAMPLE_LIMIT)))
 
         instructions = (
             "You are an observability assistant. Analyze the following logs and return "
@@ -102,6 +239,61 @@ class GeminiAnalysisTool(BaseTool):
         )
         return instructions
 
+    def _cache_key(self, prompt: str) -> str:
+        # The prompt already captures every log field sent to the model
+        payload = f"{self.GEMINI_MODEL}\n{prompt}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    def _cache_get(self, key: str) -> list[dict] | None:
+        with self._CACHE_LOCK:
+            cached = self._CACHE.get(key)
+            if cached is not None:
+                self._CACHE.move_to_end(key)
+                return cached
+
+        path = os.path.join(self.CACHE_DIR, f"{key}.json")
+        try:
+            with open(path, "rb") as fh:
+                cached = orjson.loads(fh.read())["incidents"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Failed to read Gemini cache entry %s: %s", path, e)
+            return None
+
+        self._remember(key, cached)
+        return cached
+
+    def _cache_put(self, key: str, incidents: list[dict]) -> None:
+        self._remember(key, incidents)
+
+        path = os.path.join(self.CACHE_DIR, f"{key}.json")
+        tmp_path = None
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            # A unique temp file per writer: threads analyzing identical
+            # windows must not write into the same file
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.CACHE_DIR, suffix=".tmp", delete=False
+            ) as fh:
+                tmp_path = fh.name
+                fh.write(_dumps({"incidents": incidents}))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning("Failed to write Gemini cache entry %s: %s", path, e)
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, incidents: list[dict]) -> None:
+        with self._CACHE_LOCK:
+            self._CACHE[key] = incidents
+            self._CACHE.move_to_end(key)
+            while len(self._CACHE) > self.CACHE_SIZE:
+                self._CACHE.popitem(last=False)
+
     def _extract_json_from_text(self, text: str) -> list[dict] | None:
         text = text.strip()
         if not text:
@@ -109,7 +301,7 @@ class GeminiAnalysisTool(BaseTool):
 
         # Fast path: model already returned a pure JSON array or object
         try:
-            parsed = json.loads(text)
+            parsed = _loads(text)
             if isinstance(parsed, dict) and isinstance(parsed.get("incidents"), list):
                 return parsed["incidents"]
             if isinstance(parsed, list):
@@ -123,7 +315,7 @@ class GeminiAnalysisTool(BaseTool):
         if start != -1 and end != -1 and end > start:
             candidate = text[start : end + 1]
             try:
-                parsed = json.loads(candidate)
+                parsed = _loads(candidate)
                 if isinstance(parsed, list):
                     return parsed
             except Exception:
@@ -2,15 +2,72 @@ from __future__ import annotations
 
 import os
 import time
+import atexit
+import random
+import asyncio
+import threading
 import logging
-from typing import Optional, ClassVar, Type
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, ClassVar, Tuple, Type
 
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 import httpx
+import orjson
+
+from .rate_limiter import RateLimiter
+from .run_sync import run_sync
 
 logger = logging.getLogger(__name__)
 
+# Single-paragraph ADF document wrapped around an already JSON-encoded string
+_ADF_PREFIX = b'{"type":"doc","version":1,"content":[{"type":"paragraph","content":[{"type":"text","text":'
+_ADF_SUFFIX = b"}]}]}"
+_JSON_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
+# Shared across all JiraTool calls (sync and async) to stay under Jira's limits
+_RATE_LIMITER = RateLimiter(float(os.getenv("JIRA_MAX_RPS", "10")))
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds advertised by a Retry-After header."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class JiraAuthFailures:
+    """Auth rejections seen while creating one batch of issues.
+
+    Lets the rest of the batch fail fast instead of retrying a request Jira
+    has already refused. A 401 means the credentials are bad for every
+    project; a 403 only that the account may not create issues in that one.
+    """
+
+    def __init__(self) -> None:
+        self.all_projects = False
+        self.projects: set[str] = set()
+
+    def blocks(self, project: Optional[str]) -> bool:
+        return self.all_projects or project in self.projects
+
+    def record(self, status_code: int, project: Optional[str]) -> None:
+        if status_code == 401:
+            self.all_projects = True
+        elif project:
+            self.projects.add(project)
+
 
 class JiraIssueInput(BaseModel):
     title: str = Field(..., description="Short summary of the issue")
@@ -43,6 +100,19 @@ class JiraTool(BaseTool):
     TIMEOUT: ClassVar[int] = 15
     MAX_RETRIES: ClassVar[int] = 3
     RETRY_BACKOFF: ClassVar[int] = 2
+    # Upper bound on how long a server-provided Retry-After may make us wait
+    MAX_RETRY_AFTER: ClassVar[int] = 60
+
+    # Connection pool for concurrent ticket bursts (see create_issues)
+    MAX_CONNECTIONS: ClassVar[int] = 32
+    MAX_KEEPALIVE_CONNECTIONS: ClassVar[int] = 16
+    # Maximum number of issues being created at the same time
+    MAX_CONCURRENCY: ClassVar[int] = 8
+
+    # Shared keep-alive client for sync calls, created lazily by _client()
+    SYNC_KEEPALIVE_CONNECTIONS: ClassVar[int] = 8
+    _CLIENT: ClassVar[Optional[httpx.Client]] = None
+    _CLIENT_LOCK: ClassVar[threading.Lock] = threading.Lock()
 
     def _run(
         self,
@@ -53,88 +123,234 @@ class JiraTool(BaseTool):
         **kwargs,
     ) -> str:
         """Create a Jira issue and return its URL (or empty string on failure)."""
-        project = project_key or self.DEFAULT_PROJECT
-        if not (self.BASE_URL and self.EMAIL and self.API_TOKEN and project):
-            logger.error("Jira credentials or project key not set; cannot create issue")
+        request = self._build_request(title, description, service, project_key)
+        if request is None:
             return ""
+        url, payload, auth = request
 
-        url = self.BASE_URL.rstrip("/") + "/rest/api/3/issue"
-        auth = (self.EMAIL, self.API_TOKEN)
+        attempt = 0
+        while attempt < self.MAX_RETRIES:
+            resp = None
+            try:
+                _RATE_LIMITER.acquire()
+                client = self._client()
+                resp = client.post(
+                    url,
+                    content=payload,
+                    auth=auth,
+                    headers=_JSON_HEADERS,
+                )
+                issue_url, retry = self._handle_response(resp)
+                if not retry:
+                    return issue_url
+            except Exception as e:
+                logger.exception("Network error when creating Jira issue: %s", e)
+            attempt += 1
+            if attempt < self.MAX_RETRIES:
+                time.sleep(self._retry_delay(attempt, resp))
+
+        logger.error("Failed to create Jira issue after %s attempts", self.MAX_RETRIES)
+        return ""
+
+    async def _run_async(
+        self,
+        title: str,
+        description: str,
+        service: Optional[str] = None,
+        project_key: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        auth_failures: Optional[JiraAuthFailures] = None,
+        **kwargs,
+    ) -> str:
+        """Async counterpart of _run; reuses `client` when one is provided.
+
+        Issues created as one batch share `auth_failures`, so once Jira rejects
+        the credentials (or the project) the rest of the batch is skipped.
+        """
+        if client is None:
+            async with self._async_client() as own_client:
+                return await self._run_async(
+                    title,
+                    description,
+                    service,
+                    project_key,
+                    client=own_client,
+                    auth_failures=auth_failures,
+                )
 
-        # --- IMPORTANT CHANGE: description as Atlassian Document Format (ADF) ---
-        adf_description = {
-            "type": "doc",
-            "version": 1,
-            "content": [
-                {
-                    "type": "paragraph",
-                    "content": [
-                        {"type": "text", "text": description},
-                    ],
-                }
-            ],
-        }
-
-        fields: dict = {
-            "project": {"key": project},
-            "summary": title[:254],  # safety for summary length
-            "description": adf_description,
-            "issuetype": {"name": self.ISSUE_TYPE},
-        }
-
-        if service:
-            fields.setdefault("labels", []).append(service)
-
-        payload = {"fields": fields}
+        project = project_key or self.DEFAULT_PROJECT
+        if auth_failures is not None and auth_failures.blocks(project):
+            logger.debug("Skipping Jira issue %r: Jira rejected this batch's credentials or project", title)
+            return ""
+
+        request = self._build_request(title, description, service, project_key)
+        if request is None:
+            return ""
+        url, payload, auth = request
 
         attempt = 0
         while attempt < self.MAX_RETRIES:
+            resp = None
             try:
-                with httpx.Client(timeout=self.TIMEOUT) as client:
-                    resp = client.post(
-                        url,
-                        json=payload,
-                        auth=auth,
-                        headers={"Accept": "application/json"},
-                    )
-                    try:
-                        resp.raise_for_status()
-                    except httpx.HTTPStatusError as e:
-                        # Log Jira's error details before deciding what to do
-                        error_body = None
-                        try:
-                            error_body = resp.json()
-                        except Exception:
-                            error_body = resp.text
-
-                        logger.error(
-                            "Jira API returned HTTP error (%s): %s\nResponse body: %s",
-                            resp.status_code,
-                            e,
-                            error_body,
-                        )
-
-                        # For server errors, we can retry; for 5xx we retry, for 4xx we stop
-                        if 500 <= resp.status_code < 600:
-                            attempt += 1
-                            time.sleep(self.RETRY_BACKOFF**attempt)
-                            continue
-                        return ""
-
-                    data = resp.json()
-                    issue_key = data.get("key")
-                    issue_url = (
-                        f"{self.BASE_URL.rstrip('/')}/browse/{issue_key}"
-                        if issue_key
-                        else ""
-                    )
-                    logger.info("Created Jira issue %s", issue_key)
-                    return issue_url or issue_key or ""
+                await _RATE_LIMITER.acquire_async()
+                resp = await client.post(
+                    url,
+                    content=payload,
+                    auth=auth,
+                    headers=_JSON_HEADERS,
+                )
+                issue_url, retry = self._handle_response(resp)
+                if resp.status_code in (401, 403) and auth_failures is not None:
+                    auth_failures.record(resp.status_code, project)
+                if not retry:
+                    return issue_url
             except Exception as e:
                 logger.exception("Network error when creating Jira issue: %s", e)
-                attempt += 1
-                time.sleep(self.RETRY_BACKOFF**attempt)
-                continue
+            attempt += 1
+            if attempt < self.MAX_RETRIES:
+                await asyncio.sleep(self._retry_delay(attempt, resp))
 
         logger.error("Failed to create Jira issue after %s attempts", self.MAX_RETRIES)
         return ""
+
+    def create_issues(self, issues: List[dict]) -> List[str | BaseException]:
+        """Create several Jira issues concurrently over one pooled AsyncClient.
+
+        Each item of `issues` holds the keyword arguments accepted by `_run`.
+        Results come back in input order: the issue URL, "" on failure, or the
+        exception raised for that issue.
+        """
+        if not issues:
+            return []
+
+        async def _create_all() -> List[str | BaseException]:
+            limit = asyncio.Semaphore(self.MAX_CONCURRENCY)
+            auth_failures = JiraAuthFailures()
+
+            async def _create(client: httpx.AsyncClient, issue: dict) -> str:
+                async with limit:
+                    return await self._run_async(client=client, auth_failures=auth_failures, **issue)
+
+            async with self._async_client() as client:
+                coros = [_create(client, issue) for issue in issues]
+                return await asyncio.gather(*coros, return_exceptions=True)
+
+        return run_sync(_create_all())
+
+    # ----------------- Internal helpers -----------------
+
+    @classmethod
+    def _client(cls) -> httpx.Client:
+        # Reused across calls and retries so TCP/TLS sessions stay warm
+        if cls._CLIENT is None:
+            with cls._CLIENT_LOCK:
+                if cls._CLIENT is None:
+                    client = httpx.Client(
+                        timeout=cls.TIMEOUT,
+                        http2=True,
+                        limits=httpx.Limits(
+                            max_keepalive_connections=cls.SYNC_KEEPALIVE_CONNECTIONS,
+                        ),
+                    )
+                    atexit.register(client.close)
+                    cls._CLIENT = client
+        return cls._CLIENT
+
+    @classmethod
+    def _async_client(cls) -> httpx.AsyncClient:
+        # One client per batch: an AsyncClient's pool is bound to the event
+        # loop it first runs on, and asyncio.run() creates a new loop each time.
+        # HTTP/2 multiplexes a burst of concurrent POSTs over one connection.
+        return httpx.AsyncClient(
+            timeout=cls.TIMEOUT,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=cls.MAX_CONNECTIONS,
+                max_keepalive_connections=cls.MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+
+    def _build_request(
+        self,
+        title: str,
+        description: str,
+        service: Optional[str],
+        project_key: Optional[str],
+    ) -> Optional[Tuple[str, bytes, Tuple[str, str]]]:
+        """Return (url, JSON payload bytes, auth) for an issue, or None if not configured."""
+        project = project_key or self.DEFAULT_PROJECT
+        if not (self.BASE_URL and self.EMAIL and self.API_TOKEN and project):
+            logger.error("Jira credentials or project key not set; cannot create issue")
+            return None
+
+        url = self.BASE_URL.rstrip("/") + "/rest/api/3/issue"
+        auth = (self.EMAIL, self.API_TOKEN)
+
+        # Description goes out as Atlassian Document Format (ADF). The payload is
+        # assembled from pre-encoded constant fragments; only the dynamic values
+        # are JSON-encoded per call.
+        labels = b',"labels":[' + orjson.dumps(service) + b"]" if service else b""
+        payload = b"".join(
+            (
+                b'{"fields":{"project":{"key":',
+                orjson.dumps(project),
+                b'},"summary":',
+                orjson.dumps(title[:254]),  # safety for summary length
+                b',"description":',
+                _ADF_PREFIX,
+                orjson.dumps(description),
+                _ADF_SUFFIX,
+                b',"issuetype":{"name":',
+                orjson.dumps(self.ISSUE_TYPE),
+                b"}",
+                labels,
+                b"}}",
+            )
+        )
+
+        return url, payload, auth
+
+    def _retry_delay(self, attempt: int, resp: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else jittered backoff."""
+        if resp is not None:
+            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.MAX_RETRY_AFTER)
+        # Full exponential backoff scaled by a random factor in [0.5, 1.5)
+        return self.RETRY_BACKOFF**attempt * (0.5 + random.random())
+
+    def _handle_response(self, resp: httpx.Response) -> Tuple[str, bool]:
+        """Interpret a Jira response as (issue_url, should_retry)."""
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            # Log Jira's error details before deciding what to do
+            error_body = None
+            try:
+                error_body = resp.json()
+            except Exception:
+                error_body = resp.text
+
+            logger.error(
+                "Jira API returned HTTP error (%s): %s\nResponse body: %s",
+                resp.status_code,
+                e,
+                error_body,
+            )
+
+            if resp.status_code in (401, 403):
+                logger.error("Jira rejected the credentials or project; not retrying")
+                return "", False
+
+            # Rate limiting (429) and server errors (5xx) are retried; other 4xx stop
+            return "", resp.status_code == 429 or 500 <= resp.status_code < 600
+
+        data = resp.json()
+        issue_key = data.get("key")
+        issue_url = (
+            f"{self.BASE_URL.rstrip('/')}/browse/{issue_key}"
+            if issue_key
+            else ""
+        )
+        logger.info("Created Jira issue %s", issue_key)
+        return issue_url or issue_key or "", False
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import io
 import os
 import re
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, ClassVar, Type
+import sys
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cache, lru_cache
+from itertools import repeat
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional, ClassVar, Type
 import logging
 
 from pydantic import BaseModel, Field
@@ -12,14 +19,186 @@ from crewai.tools import BaseTool
 
 logger = logging.getLogger(__name__)
 
+# Canonical str objects for level and service fields, so that millions of
+# entries share a handful of strings instead of decoding a fresh one each.
+_LEVELS = {
+    b"INFO": "INFO",
+    b"WARN": "WARN",
+    b"WARNING": "WARNING",
+    b"ERROR": "ERROR",
+    b"DEBUG": "DEBUG",
+}
+_SERVICE_INTERN: dict[bytes, str] = {}
+_SERVICE_INTERN_MAX = 4096  # bound memory if service names are unbounded
 
-@dataclass
+# Regex for lines like:
+# [2025-11-26T12:00:01Z] [INFO] [web] Started request id=...
+# Anchored at both ends with single literal spaces so non-matching lines
+# fail fast instead of backtracking through the message. Compiled once at
+# module level (and exposed on LogReaderTool) so hot loops skip the
+# class attribute lookup.
+_LINE_FORMAT = (
+    r"^\[(?P<timestamp>{field})\] \[(?P<level>INFO|W(?:ARNING|ARN)|ERROR|DEBUG)\] "
+    r"\[(?P<service>{field})\] (?P<message>{message}){end}"
+)
+# A bracketed field can only end at "]", so giving characters back never
+# helps; on 3.11+ the runs are possessive and the engine does not retry them.
+_FIELD_REPEAT = "++" if sys.version_info >= (3, 11) else "+"
+_LINE_REGEX = re.compile(
+    _LINE_FORMAT.format(field=r"[^\]]" + _FIELD_REPEAT, message=r".*", end="$"),
+    re.ASCII,
+)
+# Same format matched line by line across the raw bytes of a whole file.
+# Fields never span "\r" or "\n"; a match consumes its LF or CRLF line
+# ending, so back-to-back lines leave no gap between matches.
+_FILE_REGEX = re.compile(
+    _LINE_FORMAT.format(
+        field=r"[^\]\r\n]" + _FIELD_REPEAT, message=r"[^\r\n]*", end=r"(?:\r?\n|\r?\Z)"
+    ).encode("ascii"),
+    re.ASCII | re.MULTILINE,
+)
+
+
+_fromisoformat = datetime.fromisoformat
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _timestamp_ns(ts_raw: str) -> int | None:
+    """Parse an ISO timestamp into nanoseconds since the Unix epoch (UTC)."""
+    try:
+        # Handle timestamps like 2025-11-26T12:00:01Z
+        dt = _fromisoformat(ts_raw.replace("Z", ""))
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    except Exception:
+        return None
+    delta = dt - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1_000
+
+
+# Log lines mostly share a timestamp with a recent line (one-second
+# resolution), so memoizing recent values skips most parses.
+_parse_timestamp = lru_cache(maxsize=1024)(_timestamp_ns)
+
+
+def _ns_to_datetime(ts_ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ts_ns // 1_000)
+
+
+def _format_entries(entries: Iterable[LogEntry]) -> tuple[int, str]:
+    """Render entries for the tool's text dump; returns (count, text).
+
+    Each line is "[timestamp] [LEVEL] [service] message" preceded by a newline.
+    Lines go straight into one growing text buffer rather than a list of
+    strings kept until a join. Timestamps match datetime.isoformat(); the
+    whole-second part is reused from the previous line while it is unchanged,
+    so only sub-second digits are formatted per line.
+    """
+    buf = io.StringIO()
+    write = buf.write
+    ns_to_datetime = _ns_to_datetime
+    last_sec: int | None = None
+    sec_text = ""
+    count = 0
+    for e in entries:
+        ts_ns = e.ts_ns
+        if ts_ns is None:
+            ts = "NO_TIMESTAMP"
+        else:
+            sec, frac_ns = divmod(ts_ns, 1_000_000_000)
+            if sec != last_sec:
+                last_sec = sec
+                sec_text = ns_to_datetime(ts_ns - frac_ns).isoformat()
+            micros = frac_ns // 1_000
+            ts = f"{sec_text}.{micros:06d}" if micros else sec_text
+        write(f"\n[{ts}] [{e.level}] [{e.service}] {e.message}")
+        count += 1
+    return count, buf.getvalue()
+
+
+@dataclass(slots=True)
 class LogEntry:
-    timestamp: datetime | None
+    # Nanoseconds since the Unix epoch (UTC); None if the line had no valid timestamp
+    ts_ns: int | None
     level: str
     service: str
     message: str
-    raw: str
+    # The original line; only kept when reading with keep_raw=True
+    raw: Optional[str] = None
+
+    @property
+    def timestamp(self) -> datetime | None:
+        """ts_ns as a naive UTC datetime."""
+        ts_ns = self.ts_ns
+        return None if ts_ns is None else _ns_to_datetime(ts_ns)
+
+
+@dataclass
+class LogColumns:
+    """Parsed log lines stored column-wise: row i of every list is one entry.
+
+    Filters and aggregations (e.g. counting ERRORs per service) can scan a
+    single column instead of touching a LogEntry object per line.
+    """
+
+    ts_ns: List[int | None] = field(default_factory=list)
+    levels: List[str] = field(default_factory=list)
+    services: List[str] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    raws: List[Optional[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def append(self, entry: LogEntry) -> None:
+        self.ts_ns.append(entry.ts_ns)
+        self.levels.append(entry.level)
+        self.services.append(entry.service)
+        self.messages.append(entry.message)
+        self.raws.append(entry.raw)
+
+    def extend(self, other: LogColumns) -> None:
+        self.ts_ns.extend(other.ts_ns)
+        self.levels.extend(other.levels)
+        self.services.extend(other.services)
+        self.messages.extend(other.messages)
+        self.raws.extend(other.raws)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return map(LogEntry, self.ts_ns, self.levels, self.services, self.messages, self.raws)
+
+    def entries(self) -> List[LogEntry]:
+        """Materialize the rows as LogEntry objects."""
+        return list(self)
+
+
+def _is_log_name(name: str) -> bool:
+    # Exact suffix first; only other casings (".LOG") pay for a lowered copy,
+    # and then just of the last four characters
+    return name.endswith(".log") or name[-4:].lower() == ".log"
+
+
+def _sorted_dir(path: str) -> List[os.DirEntry]:
+    with os.scandir(path) as it:
+        return sorted(it, key=attrgetter("name"))
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    # Never fork: read_logs usually runs on a worker thread (asyncio.to_thread)
+    # while other threads may hold locks the child would inherit
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+@cache
+def _worker_reader() -> LogReaderTool:
+    return LogReaderTool()
+
+
+def _parse_file_in_worker(path: str, keep_raw: bool) -> LogColumns:
+    """Parse one log file; module-level so a process pool can pickle it."""
+    return _worker_reader()._read_file(path, keep_raw)
 
 
 class LogReaderInput(BaseModel):
@@ -43,84 +222,252 @@ class LogReaderTool(BaseTool):
     # IMPORTANT: args_schema must be a real Pydantic field, not a ClassVar
     args_schema: Type[BaseModel] = LogReaderInput
 
-    # Regex for lines like:
-    # [2025-11-26T12:00:01Z] [INFO] [web] Started request id=...
-    LINE_REGEX: ClassVar[re.Pattern] = re.compile(
-        r"\[(?P<timestamp>[^\]]+)\]\s+\[(?P<level>INFO|WARN|ERROR|WARNING|DEBUG)\]\s+\[(?P<service>[^\]]+)\]\s+(?P<message>.+)"
-    )
+    LINE_REGEX: ClassVar[re.Pattern] = _LINE_REGEX
+    FILE_REGEX: ClassVar[re.Pattern] = _FILE_REGEX
+    # Line formats tried in order by _parse_line, each defining the groups
+    # timestamp, level, service and message. A pattern that matches moves one
+    # place forward, so with several formats the common ones are tried first.
+    PATTERNS: ClassVar[List[re.Pattern]] = [_LINE_REGEX]
+
+    LEVELS: ClassVar[frozenset[str]] = frozenset({"INFO", "WARN", "ERROR", "WARNING", "DEBUG"})
 
     DEFAULT_LOG_DIR: ClassVar[str] = "logs"
 
+    # Processes used to parse several files at once; opt-in (1 = inline, 0 = one per CPU)
+    PARSE_WORKERS: ClassVar[int] = int(os.getenv("LOG_PARSE_WORKERS", "1"))
+    PARSE_CHUNKSIZE: ClassVar[int] = 4
+
     # -----------------------------
     # Core logic used by the tool
     # -----------------------------
-    def read_logs(self, log_dir: Optional[str] = None) -> List[LogEntry]:
-        """Read logs from provided directory (or LOG_DIR env or default)."""
+    def read_logs(self, log_dir: Optional[str] = None, keep_raw: bool = False) -> List[LogEntry]:
+        """Read logs from provided directory (or LOG_DIR env or default).
+
+        Entries only carry their original line in `raw` when `keep_raw` is set.
+        """
         entries: List[LogEntry] = []
+        for file_columns in self._read_files(list(self._log_files(log_dir)), keep_raw):
+            # LogColumns has a length, so each extend sizes the list once per file
+            entries.extend(file_columns)
+        return entries
+
+    def iter_logs(self, log_dir: Optional[str] = None, keep_raw: bool = False) -> Iterator[LogEntry]:
+        """Yield parsed entries file by file instead of building one big list.
+
+        Only the file currently being parsed is held in memory, so files are
+        parsed in this process one after another rather than in a pool.
+        """
+        for path in self._log_files(log_dir):
+            yield from self._read_file(path, keep_raw)
+
+    def read_logs_columnar(self, log_dir: Optional[str] = None, keep_raw: bool = False) -> LogColumns:
+        """Like read_logs, but return the parsed lines as LogColumns."""
+        columns = LogColumns()
+        for file_columns in self._read_files(list(self._log_files(log_dir)), keep_raw):
+            columns.extend(file_columns)
+        return columns
 
+    def _log_files(self, log_dir: Optional[str]) -> Iterator[str]:
+        """Yield the .log files under the log directory in read order."""
         dir_to_use = log_dir or os.getenv("LOG_DIR") or self.DEFAULT_LOG_DIR
 
-        if not os.path.isdir(dir_to_use):
+        try:
+            entries = _sorted_dir(dir_to_use)
+        except OSError:
             logger.warning("Log directory %s does not exist", dir_to_use)
-            return entries
-
-        for root, _, files in os.walk(dir_to_use):
-            for fname in sorted(files):
-                if not fname.lower().endswith(".log"):
-                    continue
-                path = os.path.join(root, fname)
-                try:
-                    with open(path, "r", encoding="utf-8", errors="replace") as fh:
-                        for raw_line in fh:
-                            line = raw_line.strip()
-                            if not line:
-                                continue
-                            parsed = self._parse_line(line)
-                            entries.append(parsed)
-                except Exception as e:
-                    logger.exception("Failed to read log file %s: %s", path, e)
-                    continue
+            return
 
-        return entries
+        yield from self._scan_entries(entries)
 
-    def _parse_line(self, line: str) -> LogEntry:
+    def _scan_entries(self, entries: List[os.DirEntry]) -> Iterator[str]:
+        """Yield a directory's .log files, then recurse into its subdirectories.
+
+        Uses the file type cached on each DirEntry instead of a stat per name;
+        like os.walk, symlinked directories are not followed.
+        """
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif _is_log_name(entry.name) and entry.is_file():
+                yield entry.path
+
+        for path in subdirs:
+            try:
+                sub_entries = _sorted_dir(path)
+            except OSError as e:
+                logger.warning("Cannot list log directory %s: %s", path, e)
+                continue
+            yield from self._scan_entries(sub_entries)
+
+    def _read_files(self, paths: List[str], keep_raw: bool) -> Iterable[LogColumns]:
+        """Parse `paths` in order, across PARSE_WORKERS processes when worthwhile."""
+        workers = min(self.PARSE_WORKERS or os.cpu_count() or 1, len(paths))
+        if workers < 2:
+            # Not worth starting processes for a single file (or when disabled)
+            return map(self._read_file, paths, repeat(keep_raw))
         try:
-            m = self.LINE_REGEX.match(line)
-            if m:
-                ts_raw = m.group("timestamp")
-                try:
-                    # Handle timestamps like 2025-11-26T12:00:01Z
-                    ts = datetime.fromisoformat(ts_raw.replace("Z", ""))
-                except Exception:
-                    ts = None
-                level = m.group("level")
-                service = m.group("service") or "unknown"
-                message = m.group("message").strip()
-                return LogEntry(
-                    timestamp=ts,
-                    level=level,
-                    service=service,
-                    message=message,
-                    raw=line,
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+                return list(
+                    pool.map(_parse_file_in_worker, paths, repeat(keep_raw), chunksize=self.PARSE_CHUNKSIZE)
                 )
+        except Exception as e:
+            logger.warning("Parallel log parsing failed (%s); parsing files sequentially", e)
+            return map(self._read_file, paths, repeat(keep_raw))
+
+    def _read_file(self, path: str, keep_raw: bool) -> LogColumns:
+        """Parse one file; on failure, return whatever was parsed before it."""
+        columns = LogColumns()
+        try:
+            self._parse_file(path, columns, keep_raw)
+        except Exception as e:
+            logger.exception("Failed to read log file %s: %s", path, e)
+        return columns
+
+    def _parse_file(self, path: str, columns: LogColumns, keep_raw: bool) -> None:
+        """Parse one log file from its raw bytes.
+
+        The file is read into memory rather than memory-mapped: a live log
+        truncated while mapped (e.g. logrotate copytruncate) would raise SIGBUS
+        and kill the process, while read() just returns the shorter file.
+        """
+        with open(path, "rb") as fh:
+            data = fh.read()
+        if data:
+            self._parse_buffer(data, columns, keep_raw)
+
+    def _parse_buffer(self, data: bytes, columns: LogColumns, keep_raw: bool) -> None:
+        """Parse a whole file's raw bytes into `columns`.
 
-            # fallback: keep the line but mark unknown
+        Well-formed lines are found with a single FILE_REGEX.finditer pass and
+        only their captured fields are decoded; whatever lies between matches
+        is decoded and handed line by line to _parse_line.
+        """
+        add_ts = columns.ts_ns.append
+        add_level = columns.levels.append
+        add_service = columns.services.append
+        add_message = columns.messages.append
+        add_raw = columns.raws.append
+        parse_gap = self._parse_gap
+        parse_ts = _timestamp_ns
+        levels = _LEVELS
+        services = _SERVICE_INTERN
+
+        # Runs of lines share a timestamp, so only parse it when it changes
+        last_ts_raw = None
+        ts_ns = None
+
+        pos = 0
+        for m in _FILE_REGEX.finditer(data):
+            if m.start() > pos:
+                parse_gap(data[pos : m.start()], columns, keep_raw)
+            pos = m.end()
+
+            # Numbered access: _FILE_REGEX's named groups are 1-4 in line order
+            message = m[4].decode("utf-8", "replace").strip()
+            if not message:
+                # Stripped, such a line no longer fits the format
+                parse_gap(m.group(0), columns, keep_raw)
+                continue
+            ts_raw, level, svc_raw = m.group(1, 2, 3)
+            service = services.get(svc_raw)
+            if service is None:
+                service = svc_raw.decode("utf-8", "replace")
+                if len(services) < _SERVICE_INTERN_MAX:
+                    services[svc_raw] = service
+            if ts_raw != last_ts_raw:
+                last_ts_raw = ts_raw
+                ts_ns = parse_ts(ts_raw.decode("utf-8", "replace"))
+            add_ts(ts_ns)
+            add_level(levels[level])
+            add_service(service)
+            add_message(message)
+            add_raw(m.group(0).decode("utf-8", "replace").rstrip() if keep_raw else None)
+
+        if pos < len(data):
+            self._parse_gap(data[pos:], columns, keep_raw)
+
+    def _parse_gap(self, chunk: bytes, columns: LogColumns, keep_raw: bool) -> None:
+        # Split like text-mode reading does (universal newlines)
+        text = chunk.decode("utf-8", "replace").replace("\r\n", "\n").replace("\r", "\n")
+        parse = self._parse_line
+        append = columns.append
+        unknown = self._unknown_entry
+        for raw_line in text.split("\n"):
+            line = raw_line.rstrip()
+            if not line:
+                continue
+            stripped = line.lstrip()
+            entry = parse(stripped)
+            if len(stripped) != len(line) and entry.level == "UNKNOWN":
+                # Keep the indentation of continuation lines (e.g. stack traces)
+                entry = unknown(line)
+            if not keep_raw:
+                entry.raw = None
+            append(entry)
+
+    def _parse_line(self, line: str) -> LogEntry:
+        try:
+            # Cheap str checks first; the patterns only see unusual lines
+            fields = self._split_fields(line) if line.startswith("[") else None
+            if fields is None:
+                m = self._match_patterns(line)
+                if not m:
+                    # fallback: keep the line but mark unknown
+                    return self._unknown_entry(line)
+                fields = m.group("timestamp", "level", "service", "message")
+
+            ts_raw, level, service, message = fields
             return LogEntry(
-                timestamp=None,
-                level="UNKNOWN",
-                service="unknown",
-                message=line,
+                ts_ns=_parse_timestamp(ts_raw),
+                level=level,
+                service=service or "unknown",
+                message=message.strip(),
                 raw=line,
             )
         except Exception as e:
             logger.exception("Unexpected error parsing log line: %s", e)
-            return LogEntry(
-                timestamp=None,
-                level="UNKNOWN",
-                service="unknown",
-                message=line,
-                raw=line,
-            )
+            return self._unknown_entry(line)
+
+    @classmethod
+    def _match_patterns(cls, line: str) -> re.Match | None:
+        patterns = cls.PATTERNS
+        for i, pattern in enumerate(patterns):
+            m = pattern.match(line)
+            if m:
+                if i:
+                    # Swap into a new list so concurrent readers never see a
+                    # half-updated one
+                    promoted = patterns[:]
+                    promoted[i - 1], promoted[i] = pattern, patterns[i - 1]
+                    cls.PATTERNS = promoted
+                return m
+        return None
+
+    def _split_fields(self, line: str) -> tuple[str, str, str, str] | None:
+        """Split "[ts] [LEVEL] [service] message" with str methods.
+
+        Returns None whenever the line does not clearly have that shape, so the
+        caller can defer to PATTERNS.
+        """
+        parts = line.split("] [", 2)
+        if len(parts) != 3 or parts[1] not in self.LEVELS:
+            return None
+        ts_raw = parts[0][1:]
+        service, sep, message = parts[2].partition("] ")
+        if not (ts_raw and service and sep) or "]" in ts_raw or "]" in service:
+            return None
+        return ts_raw, parts[1], service, message
+
+    @staticmethod
+    def _unknown_entry(line: str) -> LogEntry:
+        return LogEntry(
+            ts_ns=None,
+            level="UNKNOWN",
+            service="unknown",
+            message=line,
+            raw=line,
+        )
 
     # -----------------------------
     # REQUIRED BY BaseTool
@@ -130,20 +477,15 @@ class LogReaderTool(BaseTool):
 
         Returns a text dump of parsed log lines, which the LLM can then analyze.
         """
-        entries = self.read_logs(log_dir)
+        count, body = _format_entries(self.iter_logs(log_dir))
 
         dir_used = log_dir or os.getenv("LOG_DIR") or self.DEFAULT_LOG_DIR
 
-        if not entries:
+        if not count:
             return f"No log entries found in directory: {dir_used}"
 
-        lines: List[str] = []
-        for e in entries:
-            ts = e.timestamp.isoformat() if e.timestamp else "NO_TIMESTAMP"
-            lines.append(f"[{ts}] [{e.level}] [{e.service}] {e.message}")
-
         header = (
-            f"Read {len(entries)} log entries from '{dir_used}'. "
-            f"Below are the parsed lines (one per line):\n"
+            f"Read {count} log entries from '{dir_used}'. "
+            f"Below are the parsed lines (one per line):"
         )
-        return header + "\n".join(lines)
+        return header + body
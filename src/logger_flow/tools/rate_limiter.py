@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by sync and async callers.
+
+    `reserve(cost)` debits `cost` tokens and returns how many seconds the
+    caller has to wait before going ahead (0.0 when tokens were available).
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = rate  # tokens refilled per second
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float = 1.0) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= cost
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, cost: float = 1.0) -> None:
+        delay = self.reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, cost: float = 1.0) -> None:
+        delay = self.reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
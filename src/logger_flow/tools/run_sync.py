@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run `coro` to completion from synchronous code and return its result.
+
+    asyncio.run() refuses to start when the calling thread already runs an
+    event loop (async web handlers, notebooks, async CrewAI flows). In that
+    case the coroutine gets its own loop on a worker thread instead, and the
+    caller blocks until it finishes, like any other synchronous call.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()